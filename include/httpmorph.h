@@ -117,6 +117,7 @@ struct httpmorph_request {
 
     /* Configuration */
     uint32_t timeout_ms;
+    uint32_t connect_timeout_ms;  /* TCP connect bound (0 = use timeout_ms) */
     httpmorph_version_t http_version;
     httpmorph_browser_t browser_type;
     char *browser_version;
@@ -274,6 +275,14 @@ void httpmorph_request_set_timeout(
     uint32_t timeout_ms
 );
 
+/**
+ * Set TCP connect timeout in milliseconds (0 = fall back to request timeout)
+ */
+void httpmorph_request_set_connect_timeout(
+    httpmorph_request_t *request,
+    uint32_t connect_timeout_ms
+);
+
 /**
  * Set proxy for request
  */
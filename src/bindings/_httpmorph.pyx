@@ -113,6 +113,7 @@ cdef extern from "../include/httpmorph.h":
     int httpmorph_request_add_header(httpmorph_request_t *request, const char *key, const char *value) nogil
     int httpmorph_request_set_body(httpmorph_request_t *request, const uint8_t *body, size_t body_len) nogil
     void httpmorph_request_set_timeout(httpmorph_request_t *request, uint32_t timeout_ms) nogil
+    void httpmorph_request_set_connect_timeout(httpmorph_request_t *request, uint32_t connect_timeout_ms) nogil
     void httpmorph_request_set_proxy(httpmorph_request_t *request, const char *proxy_url, const char *username, const char *password) nogil
     void httpmorph_request_set_http2(httpmorph_request_t *request, bint enabled) nogil
     void httpmorph_request_set_verify_ssl(httpmorph_request_t *request, bint verify) nogil
@@ -133,6 +134,13 @@ cdef extern from "../include/httpmorph.h":
     # Async I/O API
     int httpmorph_pool_get_connection_fd(httpmorph_pool_t *pool, const char *host, uint16_t port) nogil
 
+cdef extern from "<stdbool.h>":
+    ctypedef bint c_bool "bool"
+
+cdef extern from "internal/proxy.h":
+    int httpmorph_parse_proxy_url(const char *proxy_url, char **host, uint16_t *port,
+                                  char **username, char **password, c_bool *use_tls) nogil
+
 
 # Python classes
 
@@ -185,6 +193,7 @@ cdef class Client:
             body: Optional request body
             **kwargs: Optional parameters including:
                 - timeout: Timeout in seconds (default: 30)
+                - connect_timeout: TCP connect timeout in seconds (default: timeout)
                 - proxy: Proxy URL or dict
                 - proxy_auth: (username, password) tuple
         """
@@ -229,6 +238,12 @@ cdef class Client:
                 timeout_ms = int(timeout * 1000) if isinstance(timeout, float) else int(timeout) * 1000
                 httpmorph_request_set_timeout(req, timeout_ms)
 
+            # Set connect timeout if provided (bounds only the TCP handshake)
+            connect_timeout = kwargs.get('connect_timeout')
+            if connect_timeout is not None:
+                connect_timeout_ms = int(connect_timeout * 1000) if isinstance(connect_timeout, float) else int(connect_timeout) * 1000
+                httpmorph_request_set_connect_timeout(req, connect_timeout_ms)
+
             # Set HTTP/2 flag if provided (default is True for Chrome)
             http2 = kwargs.get('http2', True)
             httpmorph_request_set_http2(req, http2)
@@ -253,35 +268,27 @@ cdef class Client:
                     httpmorph_request_set_tls_version(req, min_ver, max_ver)
 
             # Set proxy if provided
-            proxy = kwargs.get('proxy') or kwargs.get('proxies')
+            proxy = _select_proxy(kwargs.get('proxy') or kwargs.get('proxies'), url)
             proxy_auth = kwargs.get('proxy_auth')
 
             if proxy:
-                if isinstance(proxy, dict):
-                    # Handle proxies dict like requests library: {'http': 'http://...', 'https': 'http://...'}
-                    proxy_url = proxy.get('https') if url.startswith('https') else proxy.get('http')
-                    if proxy_url:
-                        proxy = proxy_url
-
-                if isinstance(proxy, str):
-                    # Extract username/password from proxy_auth
-                    c_username = NULL
-                    c_password = NULL
-
-                    proxy_bytes = proxy.encode('utf-8')
-                    username_bytes = None
-                    password_bytes = None
-
-                    if proxy_auth and isinstance(proxy_auth, tuple) and len(proxy_auth) == 2:
-                        username, password = proxy_auth
-                        if username:
-                            username_bytes = username.encode('utf-8')
-                            c_username = <const char*>username_bytes
-                        if password:
-                            password_bytes = password.encode('utf-8')
-                            c_password = <const char*>password_bytes
-
-                    httpmorph_request_set_proxy(req, <const char*>proxy_bytes, c_username, c_password)
+                # Extract username/password from proxy_auth
+                c_username = NULL
+                c_password = NULL
+
+                proxy_bytes = proxy.encode('utf-8')
+                username_bytes = None
+                password_bytes = None
+
+                username, password = _parse_proxy_auth(proxy_auth)
+                if username:
+                    username_bytes = username.encode('utf-8')
+                    c_username = <const char*>username_bytes
+                if password:
+                    password_bytes = password.encode('utf-8')
+                    c_password = <const char*>password_bytes
+
+                httpmorph_request_set_proxy(req, <const char*>proxy_bytes, c_username, c_password)
 
             # Build request headers dict for tracking
             request_headers = {}
@@ -448,6 +455,7 @@ cdef class Session:
             url: URL to request
             **kwargs: Optional parameters including:
                 - timeout: Timeout in seconds (default: 30)
+                - connect_timeout: TCP connect timeout in seconds (default: timeout)
                 - headers: Dict of headers
                 - json: Dict to send as JSON
                 - data/body: Request body
@@ -492,6 +500,12 @@ cdef class Session:
                 timeout_ms = int(timeout * 1000) if isinstance(timeout, float) else int(timeout) * 1000
                 httpmorph_request_set_timeout(req, timeout_ms)
 
+            # Set connect timeout if provided (bounds only the TCP handshake)
+            connect_timeout = kwargs.get('connect_timeout')
+            if connect_timeout is not None:
+                connect_timeout_ms = int(connect_timeout * 1000) if isinstance(connect_timeout, float) else int(connect_timeout) * 1000
+                httpmorph_request_set_connect_timeout(req, connect_timeout_ms)
+
             # Set HTTP/2 flag if provided (default is True for Chrome)
             http2 = kwargs.get('http2', True)
             httpmorph_request_set_http2(req, http2)
@@ -516,35 +530,27 @@ cdef class Session:
                     httpmorph_request_set_tls_version(req, min_ver, max_ver)
 
             # Set proxy if provided
-            proxy = kwargs.get('proxy') or kwargs.get('proxies')
+            proxy = _select_proxy(kwargs.get('proxy') or kwargs.get('proxies'), url)
             proxy_auth = kwargs.get('proxy_auth')
 
             if proxy:
-                if isinstance(proxy, dict):
-                    # Handle proxies dict like requests library
-                    proxy_url = proxy.get('https') if url.startswith('https') else proxy.get('http')
-                    if proxy_url:
-                        proxy = proxy_url
-
-                if isinstance(proxy, str):
-                    # Extract username/password from proxy_auth
-                    c_username = NULL
-                    c_password = NULL
-
-                    proxy_bytes = proxy.encode('utf-8')
-                    username_bytes = None
-                    password_bytes = None
-
-                    if proxy_auth and isinstance(proxy_auth, tuple) and len(proxy_auth) == 2:
-                        username, password = proxy_auth
-                        if username:
-                            username_bytes = username.encode('utf-8')
-                            c_username = <const char*>username_bytes
-                        if password:
-                            password_bytes = password.encode('utf-8')
-                            c_password = <const char*>password_bytes
-
-                    httpmorph_request_set_proxy(req, <const char*>proxy_bytes, c_username, c_password)
+                # Extract username/password from proxy_auth
+                c_username = NULL
+                c_password = NULL
+
+                proxy_bytes = proxy.encode('utf-8')
+                username_bytes = None
+                password_bytes = None
+
+                username, password = _parse_proxy_auth(proxy_auth)
+                if username:
+                    username_bytes = username.encode('utf-8')
+                    c_username = <const char*>username_bytes
+                if password:
+                    password_bytes = password.encode('utf-8')
+                    c_password = <const char*>password_bytes
+
+                httpmorph_request_set_proxy(req, <const char*>proxy_bytes, c_username, c_password)
 
             # Add headers
             headers = kwargs.get('headers')
@@ -695,6 +701,60 @@ def version():
     return ver.decode('utf-8')
 
 
+def _parse_proxy_auth(proxy_auth):
+    """Split a proxy_auth argument into (username, password)
+
+    Anything other than a 2-tuple is ignored; empty values become None.
+    """
+    if proxy_auth and isinstance(proxy_auth, tuple) and len(proxy_auth) == 2:
+        username, password = proxy_auth
+        return (username or None, password or None)
+    return (None, None)
+
+
+def _select_proxy(proxy, url):
+    """Pick the proxy URL for url from a proxy or proxies argument
+
+    A string is used as-is; a requests-style {'http': ..., 'https': ...} dict
+    is looked up by the URL scheme. Returns None when no proxy applies.
+    """
+    if isinstance(proxy, dict):
+        proxy = proxy.get('https') if url.startswith('https') else proxy.get('http')
+    if isinstance(proxy, str) and proxy:
+        return proxy
+    return None
+
+
+def _parse_proxy_url(str proxy_url):
+    """Parse a proxy URL with the same C parser used for requests
+
+    Returns (host, port, username, password, use_tls). No I/O is performed.
+    """
+    cdef char *host = NULL
+    cdef char *username = NULL
+    cdef char *password = NULL
+    cdef uint16_t port = 0
+    cdef c_bool use_tls = False
+
+    proxy_bytes = proxy_url.encode('utf-8')
+    cdef int result = httpmorph_parse_proxy_url(<const char*>proxy_bytes, &host, &port,
+                                                &username, &password, &use_tls)
+    try:
+        if result != 0:
+            raise ValueError(f"Invalid proxy URL: {proxy_url!r}")
+        return (
+            host.decode('utf-8'),
+            port,
+            username.decode('utf-8') if username is not NULL else None,
+            password.decode('utf-8') if password is not NULL else None,
+            use_tls,
+        )
+    finally:
+        free(host)
+        free(username)
+        free(password)
+
+
 # Convenience functions (will be exposed at module level)
 
 def get(str url, **kwargs):
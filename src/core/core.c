@@ -66,6 +66,10 @@ httpmorph_response_t* httpmorph_request_execute(
     /* 1. TCP Connection (direct or via proxy) */
     uint64_t connect_time = 0;
 
+    /* Connect phase may be bounded tighter than the overall request */
+    uint32_t connect_timeout_ms = request->connect_timeout_ms > 0 ?
+                                  request->connect_timeout_ms : request->timeout_ms;
+
     if (request->proxy_url) {
         /* Connect via proxy - try pool first for connection reuse */
         char *proxy_host = NULL;
@@ -99,7 +103,8 @@ httpmorph_response_t* httpmorph_request_execute(
             }
 
             /* Connect to proxy server */
-            sockfd = httpmorph_tcp_connect(proxy_host, proxy_port, request->timeout_ms, &connect_time);
+            sockfd = httpmorph_tcp_connect_ex(proxy_host, proxy_port, connect_timeout_ms,
+                                              request->timeout_ms, &connect_time);
             if (sockfd < 0) {
                 free(proxy_host);
                 free(proxy_user);
@@ -194,7 +199,7 @@ httpmorph_response_t* httpmorph_request_execute(
 
         /* If no pooled connection, create new one */
         if (sockfd < 0) {
-            sockfd = httpmorph_tcp_connect(host, port, request->timeout_ms, &connect_time);
+            sockfd = httpmorph_tcp_connect_ex(host, port, connect_timeout_ms, request->timeout_ms, &connect_time);
             if (sockfd < 0) {
                 response->error = HTTPMORPH_ERROR_NETWORK;
                 response->error_message = strdup("Failed to connect");
@@ -300,7 +305,7 @@ httpmorph_response_t* httpmorph_request_execute(
             ssl = NULL;
 
             /* Create new connection */
-            sockfd = httpmorph_tcp_connect(host, port, request->timeout_ms, &connect_time);
+            sockfd = httpmorph_tcp_connect_ex(host, port, connect_timeout_ms, request->timeout_ms, &connect_time);
             if (sockfd < 0) {
                 response->error = HTTPMORPH_ERROR_NETWORK;
                 response->error_message = strdup("Failed to connect after retry");
@@ -350,7 +355,7 @@ httpmorph_response_t* httpmorph_request_execute(
         ssl = NULL;
 
         /* Create new connection */
-        sockfd = httpmorph_tcp_connect(host, port, request->timeout_ms, &connect_time);
+        sockfd = httpmorph_tcp_connect_ex(host, port, connect_timeout_ms, request->timeout_ms, &connect_time);
         if (sockfd < 0) {
             response->error = HTTPMORPH_ERROR_NETWORK;
             response->error_message = strdup("Failed to connect");
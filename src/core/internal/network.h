@@ -14,11 +14,26 @@
  * @param port Port number
  * @param timeout_ms Connection timeout in milliseconds
  * @param connect_time Output: connection time in microseconds
- * @return socket file descriptor on success, -1 on error
+ * @return socket file descriptor on success, HTTPMORPH_ERROR_TIMEOUT if the
+ *         connect ran out of time, -1 on any other error
  */
 int httpmorph_tcp_connect(const char *host, uint16_t port, uint32_t timeout_ms,
                           uint64_t *connect_time);
 
+/**
+ * Establish a TCP connection with separate connect and receive timeouts
+ *
+ * @param host Hostname or IP address
+ * @param port Port number
+ * @param connect_timeout_ms Bound on the TCP handshake in milliseconds
+ * @param timeout_ms Receive timeout applied to the connected socket
+ * @param connect_time Output: connection time in microseconds
+ * @return socket file descriptor on success, HTTPMORPH_ERROR_TIMEOUT if the
+ *         connect ran out of time, -1 on any other error
+ */
+int httpmorph_tcp_connect_ex(const char *host, uint16_t port, uint32_t connect_timeout_ms,
+                             uint32_t timeout_ms, uint64_t *connect_time);
+
 /**
  * Cleanup expired DNS cache entries
  */
@@ -307,6 +307,14 @@ void dns_cache_clear(void) {
  */
 int httpmorph_tcp_connect(const char *host, uint16_t port, uint32_t timeout_ms,
                           uint64_t *connect_time_us) {
+    return httpmorph_tcp_connect_ex(host, port, timeout_ms, timeout_ms, connect_time_us);
+}
+
+/**
+ * Establish a TCP connection with separate connect and receive timeouts
+ */
+int httpmorph_tcp_connect_ex(const char *host, uint16_t port, uint32_t connect_timeout_ms,
+                             uint32_t timeout_ms, uint64_t *connect_time_us) {
     struct addrinfo hints, *result, *rp;
     int sockfd = -1;
     uint64_t start_time = httpmorph_get_time_us();
@@ -341,7 +349,9 @@ int httpmorph_tcp_connect(const char *host, uint16_t port, uint32_t timeout_ms,
 
     /* Try each address until we succeed */
     int ret;
+    bool timed_out = false;  /* Last attempt ran out of connect time */
     for (rp = result; rp != NULL; rp = rp->ai_next) {
+        timed_out = false;
         sockfd = socket(rp->ai_family, rp->ai_socktype, rp->ai_protocol);
         if (sockfd == -1) {
             continue;
@@ -410,21 +420,33 @@ int httpmorph_tcp_connect(const char *host, uint16_t port, uint32_t timeout_ms,
 #endif
             /* Connection in progress - wait with select using polling approach */
             uint64_t poll_start = httpmorph_get_time_us();
-            uint64_t poll_timeout_us = (uint64_t)timeout_ms * 1000;
+            uint64_t poll_timeout_us = (uint64_t)connect_timeout_ms * 1000;
             int connected = 0;
 
-            while (httpmorph_get_time_us() - poll_start < poll_timeout_us) {
+            for (;;) {
                 fd_set write_fds, except_fds;
                 struct timeval tv;
 
+                /* Read the clock once per pass so the deadline check and the
+                 * remaining budget agree; stop as soon as nothing is left */
+                uint64_t elapsed_us = httpmorph_get_time_us() - poll_start;
+                if (elapsed_us >= poll_timeout_us) {
+                    timed_out = true;
+                    break;
+                }
+
                 FD_ZERO(&write_fds);
                 FD_ZERO(&except_fds);
                 FD_SET(sockfd, &write_fds);
                 FD_SET(sockfd, &except_fds);
 
-                /* Poll every 100ms to detect errors quickly */
+                /* Poll every 100ms to detect errors quickly, but never past the deadline */
+                uint64_t remaining_us = poll_timeout_us - elapsed_us;
+                if (remaining_us > 100000) {
+                    remaining_us = 100000;  /* 100ms */
+                }
                 tv.tv_sec = 0;
-                tv.tv_usec = 100000;  /* 100ms */
+                tv.tv_usec = (long)remaining_us;
 
                 ret = select(SELECT_NFDS(sockfd), NULL, &write_fds, &except_fds, &tv);
 
@@ -533,6 +555,8 @@ int httpmorph_tcp_connect(const char *host, uint16_t port, uint32_t timeout_ms,
 #endif
 
         *connect_time_us = httpmorph_get_time_us() - start_time;
+    } else if (timed_out) {
+        return HTTPMORPH_ERROR_TIMEOUT;
     }
 
     return sockfd;
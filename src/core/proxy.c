@@ -32,8 +32,9 @@ int httpmorph_parse_proxy_url(const char *proxy_url, char **host, uint16_t *port
         if (use_tls) *use_tls = true;
     }
 
-    /* Check for username:password@ */
-    const char *at_sign = strchr(start, '@');
+    /* Check for username:password@ - split on the last '@' so an unescaped
+     * '@' inside the password stays part of it */
+    const char *at_sign = strrchr(start, '@');
     if (at_sign && username && password) {
         const char *colon = strchr(start, ':');
         if (colon && colon < at_sign) {
@@ -186,6 +186,16 @@ void httpmorph_request_set_timeout(httpmorph_request_t *request,
     }
 }
 
+/**
+ * Set TCP connect timeout in milliseconds
+ */
+void httpmorph_request_set_connect_timeout(httpmorph_request_t *request,
+                                           uint32_t connect_timeout_ms) {
+    if (request) {
+        request->connect_timeout_ms = connect_timeout_ms;
+    }
+}
+
 /**
  * Set proxy configuration
  */
@@ -31,6 +31,9 @@ from httpmorph._client_c import (
     Session,
     Timeout,
     TooManyRedirects,
+    _parse_proxy_auth,  # noqa: F401 - private, used by unit tests
+    _parse_proxy_url,  # noqa: F401 - private, used by unit tests
+    _select_proxy,  # noqa: F401 - private, used by unit tests
     cleanup,
     delete,
     get,
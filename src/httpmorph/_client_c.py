@@ -9,6 +9,7 @@ import os
 import sys
 import threading
 import uuid
+from collections import namedtuple
 from datetime import timedelta
 from http.client import responses as http_responses
 from pathlib import Path
@@ -360,6 +361,23 @@ class Response:
             if line:  # Skip empty lines
                 yield line
 
+    def close(self):
+        """Release the response (requests compatibility)
+
+        The body is read in full before the response is returned, so the
+        connection is already back in the pool; this only closes .raw.
+        """
+        if self._raw is not None:
+            self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the response when exiting context manager"""
+        self.close()
+        return False
+
 
 class Client:
     """HTTP client using C implementation"""
@@ -458,8 +476,9 @@ class Client:
         if "timeout" in kwargs:
             timeout = kwargs["timeout"]
             if isinstance(timeout, tuple):
-                # For simplicity, use the max of connect and read timeout
-                # In requests, timeout=(connect, read)
+                # In requests, timeout=(connect, read); the connect part bounds
+                # the TCP handshake and the max bounds the whole request
+                kwargs.setdefault("connect_timeout", timeout[0])
                 kwargs["timeout"] = max(timeout)
 
         # Handle files parameter - create multipart/form-data
@@ -760,8 +779,9 @@ class Session:
         if "timeout" in kwargs:
             timeout = kwargs["timeout"]
             if isinstance(timeout, tuple):
-                # For simplicity, use the max of connect and read timeout
-                # In requests, timeout=(connect, read)
+                # In requests, timeout=(connect, read); the connect part bounds
+                # the TCP handshake and the max bounds the whole request
+                kwargs.setdefault("connect_timeout", timeout[0])
                 kwargs["timeout"] = max(timeout)
 
         # Handle files parameter - create multipart/form-data
@@ -942,6 +962,25 @@ class Session:
         return False
 
 
+# Proxy argument parsing (exposed for unit tests; no I/O is performed)
+ProxyConfig = namedtuple("ProxyConfig", ["host", "port", "username", "password", "use_tls"])
+
+
+def _parse_proxy_url(proxy_url):
+    """Parse a proxy URL into a ProxyConfig using the C parser"""
+    return ProxyConfig(*_httpmorph._parse_proxy_url(proxy_url))
+
+
+def _parse_proxy_auth(proxy_auth):
+    """Split a proxy_auth argument into (username, password)"""
+    return _httpmorph._parse_proxy_auth(proxy_auth)
+
+
+def _select_proxy(proxy, url):
+    """Pick the proxy URL a request to url would use, or None"""
+    return _httpmorph._select_proxy(proxy, url)
+
+
 # Module-level convenience functions
 # Use thread-local storage to avoid race conditions in parallel test execution
 _default_sessions = threading.local()
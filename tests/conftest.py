@@ -2,13 +2,18 @@
 Pytest configuration and fixtures for httpmorph tests
 """
 
+import gc
+import hashlib
+import json
 import os
+import socket
 import subprocess
 import time
 from pathlib import Path
 
 import filelock
 import pytest
+import pytest_asyncio
 
 import httpmorph
 
@@ -37,9 +42,9 @@ def initialize_httpmorph():
         yield
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def http_server():
-    """Create a test HTTP server"""
+    """Create a test HTTP server shared by the whole session"""
     from tests.test_server import MockHTTPServer
 
     server = MockHTTPServer()
@@ -48,9 +53,9 @@ def http_server():
     server.stop()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def https_server():
-    """Create a test HTTPS server"""
+    """Create a test HTTPS server shared by the whole session"""
     from tests.test_server import MockHTTPServer
 
     try:
@@ -126,6 +131,167 @@ def mock_httpbin_server():
     server.stop()
 
 
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_client():
+    """AsyncClient shared by the whole session, bound to the session event loop
+
+    Closing an AsyncClient waits for its poll loops to drain, so one client for
+    the session instead of one per test saves that pause on every async test.
+    Tests using it must run with @pytest.mark.asyncio(loop_scope="session").
+    """
+    async with httpmorph.AsyncClient() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def _mock_proxy_server():
+    """Session-wide MockProxyServer without authentication
+
+    Session-scoped fixtures live per process, so each pytest-xdist worker
+    gets its own proxy on its own ephemeral port.
+    """
+    from tests.test_proxy_server import MockProxyServer
+
+    with MockProxyServer() as proxy:
+        yield proxy
+
+
+@pytest.fixture(scope="session")
+def _mock_auth_proxy_server():
+    """Session-wide MockProxyServer requiring testuser/testpass credentials"""
+    from tests.test_proxy_server import MockProxyServer
+
+    with MockProxyServer(username="testuser", password="testpass") as proxy:
+        yield proxy
+
+
+@pytest.fixture
+def mock_proxy(_mock_proxy_server):
+    """Shared MockProxyServer without authentication, reset for each test"""
+    _mock_proxy_server._reset()
+    return _mock_proxy_server
+
+
+@pytest.fixture
+def mock_auth_proxy(_mock_auth_proxy_server):
+    """Shared MockProxyServer requiring testuser/testpass, reset for each test"""
+    _mock_auth_proxy_server._reset()
+    return _mock_auth_proxy_server
+
+
+@pytest.fixture(scope="session")
+def closed_port_url():
+    """URL of a loopback port that was reserved and then closed
+
+    A connect normally gets an immediate RST instead of waiting for a timeout
+    or a DNS lookup. Once closed, though, the ephemeral port is free for anyone
+    to bind again, another xdist worker's mock server included, so it is only
+    very likely, not guaranteed, to still be closed when a test uses it.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture(scope="session")
+def dead_proxy_url(closed_port_url):
+    """Proxy URL nothing listens on, so proxied requests fail fast"""
+    return closed_port_url
+
+
+def _probe_proxy(proxy_url):
+    """Send one request through proxy_url; return a skip reason, or None if usable"""
+    # Test if proxy is available with a simple HTTP request. This also seeds
+    # httpmorph's process-wide DNS cache for the proxy host; target hosts are
+    # resolved by the proxy, so there is nothing else to pre-resolve locally.
+    try:
+        test_response = httpmorph.get("http://example.com", proxy=proxy_url, timeout=10)
+        # Check if proxy is offline
+        if test_response.status_code == 407:
+            return "Proxy authentication failed - proxy may be offline"
+        if test_response.text and (
+            "offline" in test_response.text.lower() or "busy" in test_response.text.lower()
+        ):
+            return f"Proxy is offline or busy: {test_response.text[:100]}"
+    except httpmorph.ConnectionError as e:
+        if "Proxy CONNECT failed" in str(e):
+            return f"Proxy is offline: {e}"
+        # Other connection errors might be transient, let tests proceed
+    except Exception:
+        # Other errors, let the actual tests handle them
+        pass
+    return None
+
+
+# How long a healthy proxy probe stays valid in the pytest cache across runs
+PROXY_PROBE_TTL = 300
+
+
+def _probe_proxy_cached(config, proxy_url):
+    """Probe proxy_url unless a recent run already found it healthy
+
+    Only healthy results are written to the pytest cache, under a hash of the
+    URL so credentials never land in .pytest_cache. A proxy that was down is
+    probed again on the next run.
+    """
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return _probe_proxy(proxy_url)
+
+    key = "httpmorph/proxy_ok/" + hashlib.sha256(proxy_url.encode()).hexdigest()[:16]
+    checked_at = cache.get(key, None)
+    if checked_at is not None and time.time() - checked_at < PROXY_PROBE_TTL:
+        return None
+
+    skip_reason = _probe_proxy(proxy_url)
+    if skip_reason is None:
+        cache.set(key, time.time())
+    return skip_reason
+
+
+def _probe_proxy_once(config, tmp_path_factory, proxy_url):
+    """Probe proxy_url once per run, sharing the result between pytest-xdist workers
+
+    Without xdist this is a single probe. Under xdist the workers' base temp
+    directories share a per-run parent, so the first worker records the result
+    there under a file lock and the others read it instead of probing again.
+    """
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        return _probe_proxy_cached(config, proxy_url)
+
+    result_file = tmp_path_factory.getbasetemp().parent / "proxy_probe.json"
+    with filelock.FileLock(f"{result_file}.lock"):
+        if result_file.is_file():
+            return json.loads(result_file.read_text())["skip_reason"]
+        skip_reason = _probe_proxy_cached(config, proxy_url)
+        result_file.write_text(json.dumps({"skip_reason": skip_reason}))
+        return skip_reason
+
+
+@pytest.fixture(scope="session")
+def real_proxy_url(pytestconfig, tmp_path_factory):
+    """Real proxy URL from TEST_PROXY_URL, probed once per session
+
+    Skips without any network call when the variable is unset. Without xdist,
+    the probe result is normally recorded by pytest_collection_finish before
+    the first test runs.
+    """
+    proxy_url = os.environ.get("TEST_PROXY_URL")
+    if not proxy_url:
+        pytest.skip("TEST_PROXY_URL environment variable not set")
+
+    if not hasattr(pytestconfig, "_proxy_skip_reason"):
+        pytestconfig._proxy_skip_reason = _probe_proxy_once(
+            pytestconfig, tmp_path_factory, proxy_url
+        )
+    if pytestconfig._proxy_skip_reason:
+        pytest.skip(pytestconfig._proxy_skip_reason)
+
+    return proxy_url
+
+
 @pytest.fixture(scope="session")
 def httpbin_host():
     """Get HTTPBin host from environment, defaults to httpmorph-bin.bytetunnels.com"""
@@ -151,10 +317,27 @@ def pytest_collection_modifyitems(config, items):
             item.add_marker(pytest.mark.slow)
         if "https_server" in item.fixturenames or "ssl" in item.nodeid:
             item.add_marker(pytest.mark.ssl)
+        # httpbin_host names a public server, so every test using it needs internet
+        if "httpbin_host" in item.fixturenames:
+            item.add_marker(pytest.mark.network)
+
+
+def pytest_collection_finish(session):
+    """Probe the real proxy once, before any test runs, if a selected test needs it
+
+    Sessions that deselect the real-proxy tests, such as CI's '-m "not proxy"',
+    never touch the network here. xdist workers leave the probe to
+    real_proxy_url, which shares one result between them.
+    """
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return
+    proxy_url = os.environ.get("TEST_PROXY_URL")
+    if proxy_url and any(
+        "real_proxy_url" in getattr(item, "fixturenames", ()) for item in session.items
+    ):
+        session.config._proxy_skip_reason = _probe_proxy_cached(session.config, proxy_url)
 
 
 def pytest_runtest_teardown(item, nextitem):
     """Force garbage collection after each test to prevent resource accumulation"""
-    import gc
-
     gc.collect()
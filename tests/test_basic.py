@@ -51,6 +51,7 @@ def test_session_creation():
         pytest.skip("Session not yet implemented")
 
 
+@pytest.mark.network
 def test_simple_get():
     """Test simple GET request"""
     response = httpmorph.get("https://ipapi.co/json/")
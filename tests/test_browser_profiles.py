@@ -10,7 +10,7 @@ import httpmorph
 class TestBrowserProfiles:
     """Test browser profile functionality"""
 
-    def test_chrome_profile_loaded(self, httpbin_host):
+    def test_chrome_profile_loaded(self):
         """Test Chrome browser profile is loaded correctly"""
         session = httpmorph.Session(browser="chrome")
         # Should have Chrome-specific settings
@@ -28,6 +28,7 @@ if not HTTPBIN_HOST:
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_large_response_requiring_reallocation():
     """
     Test that large HTTP/1.1 responses requiring buffer reallocation work correctly.
@@ -51,6 +52,7 @@ def test_large_response_requiring_reallocation():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_gzip_response_large_decompression():
     """
     Test gzipped response where decompressed size requires buffer reallocation.
@@ -76,6 +78,7 @@ def test_gzip_response_large_decompression():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_github_homepage_gzip():
     """
     Test the original bug report: fetching GitHub homepage with gzip.
@@ -100,6 +103,7 @@ def test_github_homepage_gzip():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_multiple_large_requests_sequential():
     """
     Test multiple sequential requests that each require buffer reallocation.
@@ -126,6 +130,7 @@ def test_multiple_large_requests_sequential():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_exact_buffer_boundary():
     """
     Test response that fits close to initial buffer size (control test).
@@ -145,6 +150,7 @@ def test_exact_buffer_boundary():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_incremental_reallocation():
     """
     Test response large enough to require buffer reallocation.
@@ -169,6 +175,7 @@ def test_incremental_reallocation():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_chunked_transfer_encoding():
     """
     Test chunked transfer encoding (common with dynamic content).
@@ -192,6 +199,7 @@ def test_chunked_transfer_encoding():
         assert "id" in data
 
 
+@pytest.mark.network
 def test_very_small_response():
     """
     Test very small response (< 1KB) to ensure no regression on small responses.
@@ -205,6 +213,7 @@ def test_very_small_response():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_compression_with_large_output():
     """
     Test highly compressible data that expands significantly when decompressed.
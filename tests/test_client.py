@@ -114,7 +114,7 @@ class TestClient:
             with pytest.raises(httpmorph.Timeout):
                 httpmorph.get(f"{server.url}/delay/1", timeout=0.1)
 
-    def test_response_timing(self, httpbin_host):
+    def test_response_timing(self):
         """Test response timing information"""
         with MockHTTPServer() as server:
             response = httpmorph.get(f"{server.url}/get")
@@ -122,7 +122,7 @@ class TestClient:
             assert hasattr(response, "total_time_us")
             assert response.total_time_us > 0
 
-    def test_gzip_decompression(self, httpbin_host):
+    def test_gzip_decompression(self):
         """Test automatic gzip decompression"""
         with MockHTTPServer() as server:
             response = httpmorph.get(f"{server.url}/gzip")
@@ -137,7 +137,8 @@ class TestClient:
 class TestClientWithRealHTTPS:
     """Test client with real HTTPS connections"""
 
-    def test_real_https_connection(self, httpbin_host):
+    @pytest.mark.network
+    def test_real_https_connection(self):
         """Test connection to real HTTPS server"""
         response = httpmorph.get("https://example.com")
         assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
@@ -29,6 +29,7 @@ if not HTTPBIN_HOST:
 # CONNECTION POOL CLEANUP TESTS
 # =============================================================================
 
+@pytest.mark.network
 def test_double_free_bug_reproduction():
     """
     **CRITICAL BUG TEST** - Reproduces SSL double-free crash (Issue #33)
@@ -79,6 +80,7 @@ def test_double_free_bug_reproduction():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_connection_pool_empty_body_after_multiple_requests():
     """
     Test for SSL double-free bug fix (Issue #33).
@@ -118,6 +120,7 @@ def test_connection_pool_empty_body_after_multiple_requests():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_connection_pool_multiple_empty_body_requests():
     """
     Test that multiple consecutive empty body requests don't cause issues.
@@ -135,6 +138,7 @@ def test_connection_pool_multiple_empty_body_requests():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_connection_pool_alternating_body_sizes():
     """
     Test connection pool with alternating request patterns.
@@ -163,6 +167,7 @@ def test_connection_pool_alternating_body_sizes():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_connection_pool_reuse_after_close():
     """
     Test that connection pool properly creates new connections after
@@ -188,6 +193,7 @@ def test_connection_pool_reuse_after_close():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_connection_pool_stress_with_empty_bodies():
     """
     Stress test with many requests including empty bodies.
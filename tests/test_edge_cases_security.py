@@ -31,6 +31,7 @@ if not HTTPBIN_HOST:
 # =============================================================================
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_http2_large_response_no_overflow():
     """
     Test Issue #7: HTTP/2 integer overflow protection (http2_logic.c:140)
@@ -58,6 +59,7 @@ def test_http2_large_response_no_overflow():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_http1_body_buffer_overflow_protection():
     """
     Test Issue #8: HTTP/1.1 body buffer overflow protection (http1.c:417)
@@ -76,6 +78,7 @@ def test_http1_body_buffer_overflow_protection():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_http1_chunked_overflow_protection():
     """
     Test Issue #8: HTTP/1.1 chunked encoding overflow protection (http1.c:549)
@@ -99,6 +102,7 @@ def test_http1_chunked_overflow_protection():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_compression_overflow_protection():
     """
     Test Issue #8: Compression buffer overflow protection (compression.c:55)
@@ -121,6 +125,7 @@ def test_compression_overflow_protection():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_response_headers_overflow_protection():
     """
     Test Issue #8: Response header array overflow protection (response.c:123)
@@ -139,6 +144,7 @@ def test_response_headers_overflow_protection():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_request_headers_overflow_protection():
     """
     Test Issue #8: Request header array overflow protection (request.c:112)
@@ -166,6 +172,7 @@ def test_request_headers_overflow_protection():
 # MEMORY LEAK TESTS (Issue #13 from EDGE_CASES.md)
 # =============================================================================
 
+@pytest.mark.network
 def test_dns_cache_allocation_failure_handling():
     """
     Test Issue #13: Memory leak in addrinfo_deep_copy (network.c:78-123)
@@ -195,6 +202,7 @@ def test_dns_cache_allocation_failure_handling():
 # BOUNDARY CONDITION TESTS (Issues #9-12 from EDGE_CASES.md)
 # =============================================================================
 
+@pytest.mark.network
 def test_credentials_buffer_safety():
     """
     Test Issue #9: Fixed-size credentials buffer (http1.c:201)
@@ -224,6 +232,7 @@ def test_credentials_buffer_safety():
         pass
 
 
+@pytest.mark.network
 def test_chunked_encoding_buffer_safety():
     """
     Test Issue #11: Chunked encoding fixed buffer (http1.c:465)
@@ -240,6 +249,7 @@ def test_chunked_encoding_buffer_safety():
     assert len(response.content) > 0
 
 
+@pytest.mark.network
 def test_ja3_string_buffer_safety():
     """
     Test Issue #12: JA3 string buffer safety (tls.c:410-460)
@@ -260,6 +270,7 @@ def test_ja3_string_buffer_safety():
 # THREAD SAFETY TESTS (Issues #15-17 from EDGE_CASES.md)
 # =============================================================================
 
+@pytest.mark.network
 def test_concurrent_requests_thread_safety():
     """
     Test Issues #15-17: Thread safety of DNS cache, buffer pool, and SSL_CTX
@@ -287,6 +298,7 @@ def test_concurrent_requests_thread_safety():
 # =============================================================================
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_github_gzip_regression():
     """
     Test Issue #1: Original bug - GitHub homepage with gzip
@@ -309,6 +321,7 @@ def test_github_gzip_regression():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_multiple_buffer_reallocations():
     """
     Test Issues #4-6: Multiple buffer reallocation scenarios
@@ -336,6 +349,7 @@ def test_multiple_buffer_reallocations():
 
 @pytest.mark.integration
 @pytest.mark.slow
+@pytest.mark.network
 def test_very_large_response_handling():
     """
     Stress test: Very large response to test multiple reallocations
@@ -358,6 +372,7 @@ def test_very_large_response_handling():
 
 
 @pytest.mark.integration
+@pytest.mark.network
 def test_sequential_requests_memory_stability():
     """
     Memory stability test: Sequential requests should not leak memory
@@ -22,6 +22,7 @@ class TestErrorHandling:
         with pytest.raises(httpmorph.RequestException):
             httpmorph.get("not-a-valid-url")
 
+    @pytest.mark.network
     def test_dns_resolution_failure(self):
         """Test DNS resolution failure raises ConnectionError (requests-compatible)"""
         with pytest.raises(httpmorph.ConnectionError):
@@ -33,6 +34,12 @@ class TestErrorHandling:
             with pytest.raises(httpmorph.Timeout):
                 httpmorph.get(f"{server.url}/delay/1", timeout=0.1)
 
+    def test_connect_timeout_does_not_bound_read(self):
+        """Test connect_timeout only bounds the TCP handshake, not the response wait"""
+        with MockHTTPServer() as server:
+            response = httpmorph.get(f"{server.url}/delay/1", connect_timeout=0.05, timeout=5)
+            assert response.status_code == 200
+
     def test_tls_certificate_error(self):
         """Test TLS certificate verification error
 
@@ -187,6 +194,7 @@ class TestThreadSafety:
 class TestInputValidation:
     """Test input validation"""
 
+    @pytest.mark.network
     def test_invalid_method(self):
         """Test invalid HTTP method
 
@@ -197,11 +205,13 @@ class TestInputValidation:
         response = httpmorph.get("https://example.com")
         assert response.status_code in [200, 301, 302]
 
+    @pytest.mark.network
     def test_invalid_headers(self):
         """Test invalid headers"""
         with pytest.raises((TypeError, AttributeError)):
             httpmorph.get("https://example.com", headers="not-a-dict")
 
+    @pytest.mark.network
     def test_invalid_timeout(self):
         """Test invalid timeout value
 
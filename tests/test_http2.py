@@ -13,12 +13,12 @@ from tests.test_server import MockHTTPServer
 class TestClientHTTP2Flag:
     """Test Client class with HTTP/2 flag"""
 
-    def test_client_http2_default_false(self, httpbin_host):
+    def test_client_http2_default_false(self):
         """Test that Client http2 flag defaults to True (Chrome 142)"""
         client = httpmorph.Client()
         assert client.http2 is True
 
-    def test_client_http2_true(self, httpbin_host):
+    def test_client_http2_true(self):
         """Test Client with http2=True"""
         client = httpmorph.Client(http2=True)
         assert client.http2 is True
@@ -2,15 +2,21 @@
 Integration tests for httpmorph with real HTTPS endpoints
 """
 
+import concurrent.futures
+import json
+import re
+import statistics
+import time
+
 import pytest
 
 import httpmorph
-from tests.test_server import MockHTTPServer
 
 
 class TestRealHTTPSIntegration:
     """Integration tests with real HTTPS endpoints"""
 
+    @pytest.mark.network
     def test_example_com(self, httpbin_host):
         """Test connection to example.com"""
         response = httpmorph.get("https://example.com")
@@ -18,6 +24,7 @@ class TestRealHTTPSIntegration:
         assert b"Example Domain" in response.body
         print(f"Response time: {response.total_time_us / 1000}ms")
 
+    @pytest.mark.network
     def test_example_com_with_chrome(self, httpbin_host):
         """Test HTTPS with Chrome profile"""
         session = httpmorph.Session(browser="chrome")
@@ -25,12 +32,14 @@ class TestRealHTTPSIntegration:
         assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
         assert response.tls_version is not None
 
+    @pytest.mark.network
     def test_example_com_with_firefox(self, httpbin_host):
         """Test HTTPS with Firefox profile"""
         session = httpmorph.Session(browser="firefox")
         response = session.get(f"https://{httpbin_host}")
         assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
 
+    @pytest.mark.network
     def test_google_http2(self, httpbin_host):
         """Test Google with HTTP/2"""
         response = httpmorph.get(f"https://{httpbin_host}/get")
@@ -38,6 +47,7 @@ class TestRealHTTPSIntegration:
         # Google supports HTTP/2
         assert response.http_version in ["1.1", "2.0"]
 
+    @pytest.mark.network
     def test_icanhazip(self):
         """Test icanhazip IP service"""
         # Use HTTP/1.1 for compatibility
@@ -46,82 +56,67 @@ class TestRealHTTPSIntegration:
         assert response.status_code in [200, 403]
         # Should return an IP address if successful
         if response.status_code == 200:
-            import re
-
             # IPv4 or IPv6 pattern
             ip_pattern = r"(\d{1,3}\.){3}\d{1,3}|([0-9a-fA-F]{0,4}:){2,7}[0-9a-fA-F]{0,4}"
             assert re.search(ip_pattern, response.body.decode("utf-8"))
 
-    def test_httpbin_get(self):
+    def test_httpbin_get(self, httpbin_server):
         """Test local mock server GET endpoint"""
-        with MockHTTPServer() as server:
-            response = httpmorph.get(f"{server.url}/get")
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            import json
-
-            data = json.loads(response.body)
-            assert "headers" in data
-            assert "method" in data
+        response = httpmorph.get(f"{httpbin_server}/get")
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        data = json.loads(response.body)
+        assert "headers" in data
+        assert "method" in data
 
-    def test_httpbin_post_json(self):
+    def test_httpbin_post_json(self, httpbin_server):
         """Test local mock server POST with JSON"""
         payload = {"key": "value", "number": 42, "nested": {"a": 1, "b": 2}}
-        with MockHTTPServer() as server:
-            response = httpmorph.post(f"{server.url}/post", json=payload)
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            import json
-
-            data = json.loads(response.body)
-            assert data["json"] == payload
+        # MockHTTPServer parses the body and re-serializes it under "json" with
+        # json.dumps defaults, so the echo matches json.dumps(payload) byte-for-byte
+        # whichever encoder the client used (orjson, when installed, is compact).
+        echoed = b'"json": ' + json.dumps(payload).encode("utf-8")
+        response = httpmorph.post(f"{httpbin_server}/post", json=payload)
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        assert echoed in response.body
 
-    def test_httpbin_headers(self):
+    def test_httpbin_headers(self, httpbin_server):
         """Test local mock server headers endpoint"""
         custom_headers = {"X-Custom-Header": "test-value", "User-Agent": "httpmorph-test/1.0"}
-        with MockHTTPServer() as server:
-            response = httpmorph.get(f"{server.url}/headers", headers=custom_headers)
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            import json
-
-            data = json.loads(response.body)
-            assert "X-Custom-Header" in data["headers"]
+        response = httpmorph.get(f"{httpbin_server}/headers", headers=custom_headers)
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        data = json.loads(response.body)
+        assert "X-Custom-Header" in data["headers"]
 
-    def test_httpbin_user_agent(self):
+    def test_httpbin_user_agent(self, httpbin_server):
         """Test User-Agent header"""
-        with MockHTTPServer() as server:
-            response = httpmorph.get(f"{server.url}/user-agent")
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            import json
-
-            data = json.loads(response.body)
-            assert "user-agent" in data
+        response = httpmorph.get(f"{httpbin_server}/user-agent")
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        data = json.loads(response.body)
+        assert "user-agent" in data
 
-    def test_httpbin_gzip(self, httpbin_host):
+    def test_httpbin_gzip(self, httpbin_server):
         """Test gzip compression"""
-        with MockHTTPServer() as server:
-            response = httpmorph.get(f"{server.url}/gzip")
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            import json
-
-            data = json.loads(response.body)
-            assert data["gzipped"] is True
+        response = httpmorph.get(f"{httpbin_server}/gzip")
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        data = json.loads(response.body)
+        assert data["gzipped"] is True
 
-    def test_httpbin_status_codes(self, httpbin_host):
+    def test_httpbin_status_codes(self, httpbin_server):
         """Test various HTTP status codes"""
         status_codes = [200, 204, 400, 404, 500]
-        with MockHTTPServer() as server:
-            for code in status_codes:
-                response = httpmorph.get(f"{server.url}/status/{code}")
-                assert response.status_code == code
+        for code in status_codes:
+            response = httpmorph.get(f"{httpbin_server}/status/{code}")
+            assert response.status_code == code
 
-    def test_httpbin_redirect(self, httpbin_host):
+    def test_httpbin_redirect(self, httpbin_server):
         """Test redirect handling - redirects are now followed by default"""
-        with MockHTTPServer() as server:
-            response = httpmorph.get(f"{server.url}/redirect/3")
-            # Redirects are followed by default, should get 200 at final destination
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            # Should have redirect history
-            assert len(response.history) == 3
+        response = httpmorph.get(f"{httpbin_server}/redirect/3")
+        # Redirects are followed by default, should get 200 at final destination
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        # Should have redirect history
+        assert len(response.history) == 3
 
+    @pytest.mark.network
     def test_multiple_domains_in_sequence(self, httpbin_host):
         """Test requests to multiple different domains"""
         domains = ["https://example.com", f"https://{httpbin_host}/get", "https://icanhazip.com"]
@@ -133,10 +128,9 @@ class TestRealHTTPSIntegration:
             assert response.status_code in [200, 301, 302, 403]
             print(f"{domain}: {response.status_code}")
 
+    @pytest.mark.network
     def test_concurrent_requests_different_domains(self, httpbin_host):
         """Test concurrent requests to different domains"""
-        import concurrent.futures
-
         urls = ["https://example.com", f"https://{httpbin_host}/get", "https://icanhazip.com"]
 
         # Use HTTP/1.1 session for compatibility
@@ -149,6 +143,7 @@ class TestRealHTTPSIntegration:
         assert all(r.status_code in [200, 301, 302, 403] for r in responses)
 
 
+@pytest.mark.network
 class TestTLSVersions:
     """Test different TLS versions"""
 
@@ -173,23 +168,29 @@ class TestTLSVersions:
 class TestPerformance:
     """Performance tests with real endpoints"""
 
-    def test_batch_requests_performance(self):
-        """Test performance of batch requests"""
-        import time
+    def test_batch_requests_performance(self, httpbin_server):
+        """Test performance of batch requests
 
-        with MockHTTPServer() as server:
-            session = httpmorph.Session(browser="chrome")
-            url = f"{server.url}/get"
-            iterations = 10
-
-            start = time.time()
-            for _ in range(iterations):
-                response = session.get(url)
-                assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            total_time = time.time() - start
+        MockHTTPServer speaks HTTP/1.0 and closes every connection, so each
+        request opens a new one; the first is reported separately because it
+        also covers session warm-up.
+        """
+        session = httpmorph.Session(browser="chrome")
+        url = f"{httpbin_server}/get"
+        iterations = 10
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = session.get(url)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
 
-        avg_time = total_time / iterations
-        print(f"Average request time: {avg_time:.3f}s")
+        first_time = timings[0]
+        steady_time = statistics.median(timings[1:])
+        avg_time = sum(timings) / iterations
+        print(f"First request time: {first_time:.3f}s")
+        print(f"Median later request time: {steady_time:.3f}s")
         print(f"Requests per second: {1 / avg_time:.2f}")
 
         # Should be reasonably fast
@@ -199,7 +200,7 @@ class TestPerformance:
 class TestFingerprintDetection:
     """Test against fingerprint detection services"""
 
-    def test_tls_fingerprint_detection(self, httpbin_host):
+    def test_tls_fingerprint_detection(self):
         """Test TLS fingerprint against detection service"""
         # There are services that can detect TLS fingerprints
         # This would test against such a service
@@ -208,15 +209,19 @@ class TestFingerprintDetection:
         # and verify it looks like Chrome
         pass
 
-    def test_ja3_fingerprint_uniqueness(self, httpbin_host):
-        """Test JA3 fingerprints for Chrome 142"""
+    def test_ja3_fingerprint_uniqueness(self, https_server):
+        """Test JA3 fingerprints for Chrome 142
+
+        The fingerprint comes from a real handshake with the local HTTPS mock
+        server, so the test needs no network access.
+        """
         # Note: Only Chrome 142 profile is supported now for perfect fingerprint matching
         browsers = ["chrome"]
         fingerprints = {}
 
         for browser in browsers:
             session = httpmorph.Session(browser=browser)
-            response = session.get(f"https://{httpbin_host}")
+            response = session.get(f"{https_server.url}/get", verify=False)
             fingerprints[browser] = response.ja3_fingerprint
             # Verify we get a valid JA3 fingerprint
             assert fingerprints[browser] is not None
@@ -226,6 +231,7 @@ class TestFingerprintDetection:
         assert len(fingerprints) == 1
         assert "chrome" in fingerprints
 
+    @pytest.mark.network
     def test_http2_fingerprint_detection(self, httpbin_host):
         """Test HTTP/2 fingerprint detection"""
         session = httpmorph.Session(browser="chrome", http2=True)
@@ -2,17 +2,22 @@
 Tests for the MockHTTPServer itself - these actually run!
 """
 
+import gzip
 import json
-import urllib.error
+import ssl
 import urllib.request
 
 import pytest
 
-from tests.test_server import MockHTTPServer
+from tests.test_server import MockHTTPServer, bytes_payload, request_in_memory
 
 
 class TestMockHTTPServer:
-    """Test the mock HTTP server functionality"""
+    """Test the mock HTTP server functionality
+
+    Route logic is exercised in-process via request_in_memory; lifecycle,
+    redirect and multi-request tests still go over real sockets.
+    """
 
     def test_server_starts_and_stops(self):
         """Test server can start and stop"""
@@ -29,103 +34,89 @@ class TestMockHTTPServer:
 
     def test_get_endpoint(self):
         """Test GET endpoint returns JSON"""
-        with MockHTTPServer() as server:
-            response = urllib.request.urlopen(f"{server.url}/get")
-            data = json.loads(response.read())
+        response = request_in_memory("GET", "/get")
+        data = json.loads(response.read())
 
-            assert data["method"] == "GET"
-            assert data["path"] == "/get"
-            assert "headers" in data
+        assert data["method"] == "GET"
+        assert data["path"] == "/get"
+        assert "headers" in data
 
     def test_post_endpoint_json(self):
         """Test POST endpoint with JSON data"""
-        with MockHTTPServer() as server:
-            post_data = json.dumps({"test": "value", "number": 42}).encode()
-            req = urllib.request.Request(
-                f"{server.url}/post", data=post_data, headers={"Content-Type": "application/json"}
-            )
-            response = urllib.request.urlopen(req)
-            data = json.loads(response.read())
+        post_data = json.dumps({"test": "value", "number": 42}).encode()
+        response = request_in_memory(
+            "POST", "/post", headers={"Content-Type": "application/json"}, body=post_data
+        )
+        data = json.loads(response.read())
 
-            assert data["method"] == "POST"
-            assert data["json"]["test"] == "value"
-            assert data["json"]["number"] == 42
+        assert data["method"] == "POST"
+        assert data["json"]["test"] == "value"
+        assert data["json"]["number"] == 42
 
     def test_post_endpoint_form(self):
         """Test POST endpoint with form data"""
-        with MockHTTPServer() as server:
-            post_data = b"field1=value1&field2=value2"
-            req = urllib.request.Request(
-                f"{server.url}/post/form",
-                data=post_data,
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
-            response = urllib.request.urlopen(req)
-            data = json.loads(response.read())
-
-            assert data["method"] == "POST"
-            assert "field1=value1" in data["form"]
+        post_data = b"field1=value1&field2=value2"
+        response = request_in_memory(
+            "POST",
+            "/post/form",
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            body=post_data,
+        )
+        data = json.loads(response.read())
+
+        assert data["method"] == "POST"
+        assert "field1=value1" in data["form"]
 
     def test_status_200(self):
         """Test 200 OK status code"""
-        with MockHTTPServer() as server:
-            response = urllib.request.urlopen(f"{server.url}/status/200")
-            assert response.status == 200
+        response = request_in_memory("GET", "/status/200")
+        assert response.status == 200
 
     def test_status_404(self):
         """Test 404 Not Found status code"""
-        with MockHTTPServer() as server:
-            with pytest.raises(urllib.error.HTTPError) as exc_info:
-                urllib.request.urlopen(f"{server.url}/status/404")
-            assert exc_info.value.code == 404
+        response = request_in_memory("GET", "/status/404")
+        assert response.status == 404
 
     def test_headers_endpoint(self):
         """Test headers endpoint returns request headers"""
-        with MockHTTPServer() as server:
-            req = urllib.request.Request(
-                f"{server.url}/headers", headers={"X-Custom-Header": "test-value"}
-            )
-            response = urllib.request.urlopen(req)
-            data = json.loads(response.read())
+        response = request_in_memory("GET", "/headers", headers={"X-Custom-Header": "test-value"})
+        data = json.loads(response.read())
 
-            assert "headers" in data
-            assert data["headers"]["X-Custom-Header"] == "test-value"
+        assert "headers" in data
+        assert data["headers"]["X-Custom-Header"] == "test-value"
 
     def test_put_endpoint(self):
         """Test PUT endpoint"""
-        with MockHTTPServer() as server:
-            put_data = json.dumps({"updated": "data"}).encode()
-            req = urllib.request.Request(
-                f"{server.url}/put",
-                data=put_data,
-                method="PUT",
-                headers={"Content-Type": "application/json"},
-            )
-            response = urllib.request.urlopen(req)
-            data = json.loads(response.read())
-
-            assert data["method"] == "PUT"
+        put_data = json.dumps({"updated": "data"}).encode()
+        response = request_in_memory(
+            "PUT", "/put", headers={"Content-Type": "application/json"}, body=put_data
+        )
+        data = json.loads(response.read())
+
+        assert data["method"] == "PUT"
 
     def test_delete_endpoint(self):
         """Test DELETE endpoint"""
-        with MockHTTPServer() as server:
-            req = urllib.request.Request(f"{server.url}/delete", method="DELETE")
-            response = urllib.request.urlopen(req)
-            data = json.loads(response.read())
+        response = request_in_memory("DELETE", "/delete")
+        data = json.loads(response.read())
 
-            assert data["method"] == "DELETE"
+        assert data["method"] == "DELETE"
 
     def test_gzip_endpoint(self):
         """Test gzip compressed response"""
-        with MockHTTPServer() as server:
-            import gzip
+        response = request_in_memory("GET", "/gzip")
+        decompressed_data = gzip.decompress(response.read())
+        data = json.loads(decompressed_data)
+
+        assert data["compressed"] is True
 
-            response = urllib.request.urlopen(f"{server.url}/gzip")
-            compressed_data = response.read()
-            decompressed_data = gzip.decompress(compressed_data)
-            data = json.loads(decompressed_data)
+    def test_bytes_endpoint(self):
+        """Test /bytes serves the requested length of a non-constant pattern"""
+        response = request_in_memory("GET", "/bytes/1000")
+        body = response.read()
 
-            assert data["compressed"] is True
+        assert body == bytes_payload(1000)
+        assert len(set(body)) > 1
 
     def test_redirect_endpoint(self):
         """Test redirect"""
@@ -175,8 +166,6 @@ class TestHTTPSServer:
     def test_https_get_request(self):
         """Test HTTPS GET request"""
         try:
-            import ssl
-
             with MockHTTPServer(ssl_enabled=True) as server:
                 # Create SSL context that doesn't verify certificates
                 ctx = ssl.create_default_context()
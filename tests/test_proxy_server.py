@@ -3,10 +3,20 @@ Simple HTTP proxy server for testing
 """
 
 import base64
-import select
+import hmac
+import os
+import selectors
 import socket
+import socketserver
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Relay in 64 KiB reads, several 16 KiB TLS records per recv() call
+RELAY_CHUNK = 65536
+# Kernel buffers on the outbound hop, large enough to back those reads
+RELAY_SOCKET_BUFFER = 262144
+# Seconds to wait for the outbound TCP handshake before answering 502
+TARGET_CONNECT_TIMEOUT = 5
 
 
 class ProxyHandler(BaseHTTPRequestHandler):
@@ -16,31 +26,33 @@ class ProxyHandler(BaseHTTPRequestHandler):
         """Suppress log messages during tests"""
         pass
 
+    def _authorized(self):
+        """Check Proxy-Authorization against the server's credentials
+
+        Sends 407 when the header is missing and 403 when it does not match,
+        then returns False; returns True when no auth is configured.
+        """
+        expected = self.server.expected_auth
+        if expected is None:
+            return True
+
+        auth_header = self.headers.get("Proxy-Authorization")
+        if not auth_header:
+            self.send_response(407)
+            self.send_header("Proxy-Authenticate", 'Basic realm="Proxy"')
+            self.end_headers()
+            return False
+
+        if not hmac.compare_digest(auth_header.encode(), expected):
+            self.send_response(403)
+            self.end_headers()
+            return False
+        return True
+
     def do_CONNECT(self):
         """Handle CONNECT method for HTTPS proxying"""
-        # Check for Proxy-Authorization if auth is required
-        if hasattr(self.server, "username") and self.server.username:
-            auth_header = self.headers.get("Proxy-Authorization")
-            if not auth_header:
-                self.send_response(407)
-                self.send_header("Proxy-Authenticate", 'Basic realm="Proxy"')
-                self.end_headers()
-                return
-
-            # Verify credentials
-            try:
-                auth_type, credentials = auth_header.split(" ", 1)
-                if auth_type == "Basic":
-                    decoded = base64.b64decode(credentials).decode("utf-8")
-                    username, password = decoded.split(":", 1)
-                    if username != self.server.username or password != self.server.password:
-                        self.send_response(403)
-                        self.end_headers()
-                        return
-            except Exception:
-                self.send_response(403)
-                self.end_headers()
-                return
+        if not self._authorized():
+            return
 
         # Parse host and port
         host, port = self.path.split(":")
@@ -48,77 +60,97 @@ class ProxyHandler(BaseHTTPRequestHandler):
 
         try:
             # Connect to target server
-            target_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            target_sock.connect((host, port))
+            target_sock = self._open_target(host, port)
 
             # Send success response
             self.send_response(200, "Connection Established")
             self.end_headers()
 
-            # Relay data between client and target using select()
-            sockets = [self.connection, target_sock]
+            # Relay data between client and target; DefaultSelector picks
+            # epoll/kqueue where available, so idle tunnels cost no CPU
             timeout = 30  # 30 second timeout for idle connections
+            peers = {self.connection: target_sock, target_sock: self.connection}
+            # On Linux, splice() moves bytes between the sockets through a
+            # pipe inside the kernel instead of copying them through Python
+            pipe = os.pipe() if hasattr(os, "splice") else None
 
-            while True:
-                try:
-                    # Wait for data on either socket with timeout
-                    readable, _, exceptional = select.select(sockets, [], sockets, timeout)
-
-                    # If timeout or error, close connection
-                    if not readable or exceptional:
-                        break
-
-                    # Process readable sockets
-                    for sock in readable:
-                        try:
-                            data = sock.recv(4096)
-                            if not data:
-                                # Connection closed by one side
-                                target_sock.close()
-                                return
-
-                            # Send data to the other socket
-                            if sock is self.connection:
-                                target_sock.sendall(data)
-                            else:
-                                self.connection.sendall(data)
-                        except Exception:
-                            # Error reading/writing, close connection
-                            target_sock.close()
-                            return
-                except Exception:
-                    break
+            try:
+                with selectors.DefaultSelector() as selector:
+                    for sock in peers:
+                        selector.register(sock, selectors.EVENT_READ)
+
+                    while True:
+                        # Wait for data on either socket with timeout
+                        events = selector.select(timeout)
+
+                        # If timeout, close connection
+                        if not events:
+                            break
+
+                        # Forward from each readable socket to the other one;
+                        # stop once either side closes
+                        if not all(self._forward(key.fileobj, peers, pipe) for key, _ in events):
+                            break
+            except Exception:
+                # Error reading/writing, close connection
+                pass
+            finally:
+                if pipe is not None:
+                    os.close(pipe[0])
+                    os.close(pipe[1])
 
             target_sock.close()
         except Exception:
             self.send_response(502)
             self.end_headers()
 
+    def _forward(self, sock, peers, pipe):
+        """Move one chunk from sock to its peer; return False once sock is closed"""
+        peer = peers[sock]
+        if pipe is None:
+            data = sock.recv(RELAY_CHUNK)
+            if not data:
+                return False
+            peer.sendall(data)
+            return True
+
+        # The pipe holds 64 KiB by default, so one chunk always fits and is
+        # drained before the next splice into it
+        read_fd, write_fd = pipe
+        pending = os.splice(sock.fileno(), write_fd, RELAY_CHUNK)
+        if not pending:
+            return False
+        while pending:
+            pending -= os.splice(read_fd, peer.fileno(), pending)
+        return True
+
+    def _open_target(self, host, port):
+        """Open the outbound hop, over a socketpair for bridged servers"""
+        bridged = self.server.bridges.get((host, port))
+        if bridged is None:
+            target_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Set before connect() so the TCP window is negotiated to match
+            target_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RELAY_SOCKET_BUFFER)
+            target_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, RELAY_SOCKET_BUFFER)
+            target_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Bound the handshake so an unreachable target fails fast, then
+            # relay in blocking mode
+            target_sock.settimeout(TARGET_CONNECT_TIMEOUT)
+            target_sock.connect((host, port))
+            target_sock.settimeout(None)
+            return target_sock
+
+        # AF_UNIX pair where available; Python emulates it over loopback TCP elsewhere
+        target_sock, origin_sock = socket.socketpair()
+        thread = threading.Thread(target=bridged.serve_connection, args=(origin_sock,))
+        thread.daemon = True
+        thread.start()
+        return target_sock
+
     def do_GET(self):
         """Handle GET requests (for HTTP proxying)"""
-        # Check for Proxy-Authorization if auth is required
-        if hasattr(self.server, "username") and self.server.username:
-            auth_header = self.headers.get("Proxy-Authorization")
-            if not auth_header:
-                self.send_response(407)
-                self.send_header("Proxy-Authenticate", 'Basic realm="Proxy"')
-                self.end_headers()
-                return
-
-            # Verify credentials
-            try:
-                auth_type, credentials = auth_header.split(" ", 1)
-                if auth_type == "Basic":
-                    decoded = base64.b64decode(credentials).decode("utf-8")
-                    username, password = decoded.split(":", 1)
-                    if username != self.server.username or password != self.server.password:
-                        self.send_response(403)
-                        self.end_headers()
-                        return
-            except Exception:
-                self.send_response(403)
-                self.end_headers()
-                return
+        if not self._authorized():
+            return
 
         # For testing, just return a simple response
         self.send_response(200)
@@ -128,6 +160,24 @@ class ProxyHandler(BaseHTTPRequestHandler):
         self.wfile.write(b"Proxied response")
 
 
+class ProxyHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTPServer that skips the reverse DNS lookup when binding
+
+    Each connection gets its own daemon thread, so a long-lived CONNECT tunnel
+    does not hold up the accept loop for the next client.
+
+    HTTPServer.server_bind resolves server_name with socket.getfqdn(), which
+    the proxy never uses and which can stall on hosts without working reverse
+    DNS for loopback.
+    """
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)
+        host, port = self.server_address[:2]
+        self.server_name = host
+        self.server_port = port
+
+
 class MockProxyServer:
     """Mock HTTP proxy server for testing"""
 
@@ -137,28 +187,45 @@ class MockProxyServer:
         self.password = password
         self.server = None
         self.thread = None
+        self.bridges = {}
+
+    def bridge_to(self, server):
+        """Tunnel CONNECTs for a local MockHTTPServer over a socketpair
+
+        Skips the loopback TCP handshake on the proxy-to-origin hop.
+        """
+        self.bridges[("127.0.0.1", server.port)] = server
+
+    def _reset(self):
+        """Drop per-test state so a running server can be shared between tests"""
+        self.bridges.clear()
 
     def start(self):
         """Start the proxy server"""
-        self.server = HTTPServer(("127.0.0.1", self.port), ProxyHandler)
+        self.server = ProxyHTTPServer(("127.0.0.1", self.port), ProxyHandler)
+        self.server.bridges = self.bridges
 
-        # Attach auth credentials to server
+        # Encode the expected Proxy-Authorization once, not on every request
+        self.server.expected_auth = None
         if self.username:
-            self.server.username = self.username
-            self.server.password = self.password
+            credentials = f"{self.username}:{self.password}".encode()
+            self.server.expected_auth = b"Basic " + base64.b64encode(credentials)
 
         # Get actual port if 0 was specified
         self.port = self.server.server_port
 
-        # Start in background thread
-        self.thread = threading.Thread(target=self.server.serve_forever)
+        # Start in background thread. The socket is already listening, so
+        # early connects queue in the backlog; just wait for the loop to run.
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._serve, args=(ready,))
         self.thread.daemon = True
         self.thread.start()
+        ready.wait(timeout=1)
 
-        # Wait a bit for server to start
-        import time
-
-        time.sleep(0.1)
+    def _serve(self, ready):
+        """Signal readiness, then run the accept loop"""
+        ready.set()
+        self.server.serve_forever()
 
     def stop(self):
         """Stop the proxy server"""
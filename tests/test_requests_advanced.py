@@ -4,52 +4,83 @@ Advanced test suite for requests compatibility - streaming, files, etc.
 Tests for Phase 2/3 features that require more complex implementation.
 """
 
+import concurrent.futures
 import io
 import os
-import tempfile
-from pathlib import Path
 
 import pytest
 
 import httpmorph
+from tests.test_server import bytes_payload
 
+# System CA bundle locations, checked in order
+CA_BUNDLE_PATHS = [
+    "/etc/ssl/certs/ca-certificates.crt",  # Debian/Ubuntu
+    "/etc/ssl/certs/ca-bundle.crt",  # CentOS/RHEL
+    "/etc/ssl/ca-bundle.pem",  # OpenSUSE
+]
 
-class TestResponseIterContent:
-    """Tests for Response.iter_content() streaming"""
 
-    def test_iter_content_basic(self, httpbin_server):
-        """Test iter_content() yields chunks"""
-        response = httpmorph.get(f"{httpbin_server}/bytes/1024", stream=True)
+@pytest.fixture(scope="module")
+def sample_response(httpbin_server):
+    """One plain GET /get response shared by the read-only attribute tests
 
-        chunks = list(response.iter_content(chunk_size=256))
+    Tests that mutate the response or need a specific endpoint make their own.
+    """
+    return httpmorph.get(f"{httpbin_server}/get")
 
-        assert len(chunks) > 0
-        total_size = sum(len(chunk) for chunk in chunks)
-        assert total_size == 1024
 
-    def test_iter_content_default_chunk_size(self, httpbin_server):
-        """Test iter_content() with default chunk size"""
-        response = httpmorph.get(f"{httpbin_server}/bytes/5000", stream=True)
+@pytest.fixture
+def pooling_session():
+    """Fresh default Session for the connection pooling tests, closed afterwards"""
+    session = httpmorph.Session()
+    yield session
+    session.close()
 
-        chunks = list(response.iter_content())
-        assert len(chunks) > 0
 
-    def test_iter_content_decode_unicode(self, httpbin_server):
-        """Test iter_content() with decode_unicode=True"""
-        response = httpmorph.get(f"{httpbin_server}/get", stream=True)
+@pytest.fixture
+def http11_session():
+    """Fresh HTTP/1.1-only Session, closed afterwards"""
+    session = httpmorph.Session(http2=False)
+    yield session
+    session.close()
 
-        chunks = list(response.iter_content(decode_unicode=True))
 
-        for chunk in chunks:
-            assert isinstance(chunk, str)
+@pytest.fixture(scope="session")
+def system_ca_bundle():
+    """First system CA bundle that exists, or None; looked up once per session"""
+    return next((path for path in CA_BUNDLE_PATHS if os.path.exists(path)), None)
 
-    def test_iter_content_without_stream(self, httpbin_server):
-        """Test iter_content() when stream=False"""
-        response = httpmorph.get(f"{httpbin_server}/bytes/100")
 
-        # Should still work, just returns content in one chunk
-        chunks = list(response.iter_content())
-        assert len(chunks) >= 1
+class TestResponseIterContent:
+    """Tests for Response.iter_content() streaming"""
+
+    @pytest.mark.parametrize(
+        "size,chunk_kw,stream",
+        [
+            pytest.param(1024, {"chunk_size": 256}, True, id="chunk-256"),
+            pytest.param(5000, {}, True, id="default-chunk-size"),
+            pytest.param(100, {}, False, id="without-stream"),
+        ],
+    )
+    def test_iter_content(self, httpbin_server, size, chunk_kw, stream):
+        """Test iter_content() yields chunks covering the whole body, streamed or not"""
+        chunk_count = total_size = 0
+        with httpmorph.get(f"{httpbin_server}/bytes/{size}", stream=stream) as response:
+            for chunk in response.iter_content(**chunk_kw):
+                chunk_count += 1
+                total_size += len(chunk)
+
+        assert chunk_count > 0
+        assert total_size == size
+
+    def test_iter_content_decode_unicode(self, httpbin_server):
+        """Test iter_content() with decode_unicode=True"""
+        with httpmorph.get(f"{httpbin_server}/get", stream=True) as response:
+            chunks = list(response.iter_content(decode_unicode=True))
+
+            for chunk in chunks:
+                assert isinstance(chunk, str)
 
 
 class TestResponseIterLines:
@@ -57,29 +88,26 @@ class TestResponseIterLines:
 
     def test_iter_lines_basic(self, httpbin_server):
         """Test iter_lines() yields lines"""
-        response = httpmorph.get(f"{httpbin_server}/get", stream=True)
+        with httpmorph.get(f"{httpbin_server}/get", stream=True) as response:
+            lines = list(response.iter_lines())
 
-        lines = list(response.iter_lines())
-
-        assert len(lines) > 0
-        for line in lines:
-            assert isinstance(line, (bytes, str))
+            assert len(lines) > 0
+            for line in lines:
+                assert isinstance(line, (bytes, str))
 
     def test_iter_lines_decode_unicode(self, httpbin_server):
         """Test iter_lines() with decode_unicode=True"""
-        response = httpmorph.get(f"{httpbin_server}/get", stream=True)
-
-        lines = list(response.iter_lines(decode_unicode=True))
+        with httpmorph.get(f"{httpbin_server}/get", stream=True) as response:
+            lines = list(response.iter_lines(decode_unicode=True))
 
-        for line in lines:
-            assert isinstance(line, str)
+            for line in lines:
+                assert isinstance(line, str)
 
     def test_iter_lines_delimiter(self, httpbin_server):
         """Test iter_lines() with custom delimiter"""
-        response = httpmorph.get(f"{httpbin_server}/get", stream=True)
-
-        lines = list(response.iter_lines(delimiter=b"\n"))
-        assert len(lines) > 0
+        with httpmorph.get(f"{httpbin_server}/get", stream=True) as response:
+            lines = list(response.iter_lines(delimiter=b"\n"))
+            assert len(lines) > 0
 
 
 class TestStreamParameter:
@@ -94,73 +122,56 @@ class TestStreamParameter:
 
     def test_stream_true_defers_content(self, httpbin_server):
         """Test stream=True defers content loading"""
-        response = httpmorph.get(f"{httpbin_server}/bytes/1000", stream=True)
-
-        # Content should not be loaded yet
-        # Can iterate over it
-        chunks = list(response.iter_content(chunk_size=100))
-        assert len(chunks) == 10
+        with httpmorph.get(f"{httpbin_server}/bytes/1000", stream=True) as response:
+            # Content should not be loaded yet
+            # Can iterate over it
+            chunk_count = sum(1 for _ in response.iter_content(chunk_size=100))
+        assert chunk_count == 10
 
     def test_stream_large_file(self, httpbin_server):
         """Test streaming large file doesn't load into memory"""
-        # Download 10MB file
-        response = httpmorph.get(
-            f"{httpbin_server}/bytes/10485760",  # 10MB
-            stream=True,
-        )
-
-        # Should be able to iterate without loading all into memory
-        chunk_count = 0
-        for chunk in response.iter_content(chunk_size=8192):
-            chunk_count += 1
-            if chunk_count > 100:  # Just test first 100 chunks
-                break
+        # 1 MiB covers the 100 chunks read below; the body is currently
+        # buffered whole, so a larger file only costs transfer time
+        with httpmorph.get(f"{httpbin_server}/bytes/1048576", stream=True) as response:
+            # Should be able to iterate without loading all into memory
+            chunk_count = 0
+            for chunk in response.iter_content(chunk_size=8192):
+                assert len(chunk) == 8192
+                chunk_count += 1
+                if chunk_count > 100:  # Just test first 100 chunks
+                    break
 
-        assert chunk_count > 0
+            assert chunk_count == 101
 
 
 class TestFilesParameter:
-    """Tests for files= parameter (multipart upload)"""
+    """Tests for files= parameter (multipart upload)
+
+    For multipart requests MockHTTPServer echoes an empty "data" and a null
+    "json", so a quoted key-value substring can only come from the parsed
+    "files" or "form" sections.
+
+    The substrings also assume MockHTTPServer's do_POST writes the echo with
+    json.dumps defaults (", " and ": " separators); against a server with
+    another encoder, parse the echo instead.
+    """
 
     def test_files_single_file(self, httpbin_server):
         """Test uploading single file"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            f.write("test file content")
-            temp_path = f.name
-
-        try:
-            with open(temp_path, "rb") as f:
-                files = {"file": f}
-                response = httpmorph.post(f"{httpbin_server}/post", files=files)
+        files = {"file": io.BytesIO(b"test file content")}
+        response = httpmorph.post(f"{httpbin_server}/post", files=files)
 
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            data = response.json()
-            assert "files" in data
-        finally:
-            os.unlink(temp_path)
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        assert b'"files": {"file": ' in response.content
 
     def test_files_multiple_files(self, httpbin_server):
         """Test uploading multiple files"""
-        temp_files = []
-
-        try:
-            # Create two temp files
-            for i in range(2):
-                f = tempfile.NamedTemporaryFile(mode="w", delete=False)
-                f.write(f"file {i} content")
-                f.close()
-                temp_files.append(f.name)
-
-            with open(temp_files[0], "rb") as f1, open(temp_files[1], "rb") as f2:
-                files = {"file1": f1, "file2": f2}
-                response = httpmorph.post(f"{httpbin_server}/post", files=files)
-
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            data = response.json()
-            assert "files" in data
-        finally:
-            for path in temp_files:
-                os.unlink(path)
+        files = {"file1": io.BytesIO(b"file 0 content"), "file2": io.BytesIO(b"file 1 content")}
+        response = httpmorph.post(f"{httpbin_server}/post", files=files)
+
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        assert b'"files": {"file1": ' in response.content
+        assert b'"file2": ' in response.content
 
     def test_files_with_filename(self, httpbin_server):
         """Test uploading file with custom filename"""
@@ -170,8 +181,7 @@ class TestFilesParameter:
         response = httpmorph.post(f"{httpbin_server}/post", files=files)
 
         assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-        data = response.json()
-        assert "custom_name.txt" in str(data.get("files", ""))
+        assert b'"file": "custom_name.txt:' in response.content
 
     def test_files_with_content_type(self, httpbin_server):
         """Test uploading file with custom content type"""
@@ -184,23 +194,14 @@ class TestFilesParameter:
 
     def test_files_and_data_combined(self, httpbin_server):
         """Test uploading files with additional form data"""
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            f.write("test")
-            temp_path = f.name
-
-        try:
-            with open(temp_path, "rb") as f:
-                files = {"upload": f}
-                data = {"field1": "value1", "field2": "value2"}
+        files = {"upload": io.BytesIO(b"test")}
+        data = {"field1": "value1", "field2": "value2"}
 
-                response = httpmorph.post(f"{httpbin_server}/post", files=files, data=data)
+        response = httpmorph.post(f"{httpbin_server}/post", files=files, data=data)
 
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-            result = response.json()
-            assert result["form"]["field1"] == "value1"
-            assert result["form"]["field2"] == "value2"
-        finally:
-            os.unlink(temp_path)
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+        assert b'"field1": "value1"' in response.content
+        assert b'"field2": "value2"' in response.content
 
 
 class TestVerifyParameter:
@@ -218,27 +219,14 @@ class TestVerifyParameter:
         response = httpmorph.get(f"{httpbin_server}/get", verify=False)
         assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
 
-    def test_verify_ca_bundle_path(self, httpbin_server):
+    def test_verify_ca_bundle_path(self, httpbin_server, system_ca_bundle):
         """Test verify with path to CA bundle"""
-        # Test with system CA bundle
-        ca_paths = [
-            "/etc/ssl/certs/ca-certificates.crt",  # Debian/Ubuntu
-            "/etc/ssl/certs/ca-bundle.crt",  # CentOS/RHEL
-            "/etc/ssl/ca-bundle.pem",  # OpenSUSE
-        ]
-
-        ca_path = None
-        for path in ca_paths:
-            if Path(path).exists():
-                ca_path = path
-                break
-
-        if ca_path:
-            response = httpmorph.get(f"{httpbin_server}/get", verify=ca_path)
-            assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
-        else:
+        if system_ca_bundle is None:
             pytest.skip("No CA bundle found on system")
 
+        response = httpmorph.get(f"{httpbin_server}/get", verify=system_ca_bundle)
+        assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
+
 
 class TestCertParameter:
     """Tests for cert= parameter (client certificates)"""
@@ -278,31 +266,28 @@ class TestProxiesParameter:
 class TestSessionConnectionPooling:
     """Tests for session connection pooling"""
 
-    def test_session_reuses_connection(self, httpbin_server):
-        """Test session reuses TCP connection"""
-        session = httpmorph.Session()
+    def test_session_concurrent_requests_same_host(self, httpbin_server, pooling_session):
+        """Test session serves concurrent requests to one host
 
-        # Make multiple requests to same host
-        response1 = session.get(f"{httpbin_server}/get")
-        response2 = session.get(f"{httpbin_server}/headers")
-        response3 = session.get(f"{httpbin_server}/ip")
+        In-flight requests each need their own connection, and MockHTTPServer
+        closes every connection anyway, so this checks concurrency, not reuse.
+        """
+        paths = ["/get", "/headers", "/ip"]
 
-        # All should succeed
-        assert response1.status_code == 200
-        assert response2.status_code == 200
-        assert response3.status_code == 200
+        # Make multiple requests to same host at once
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            responses = list(
+                executor.map(lambda path: pooling_session.get(f"{httpbin_server}{path}"), paths)
+            )
 
-        # Connection should be reused (hard to test directly)
-        # But timing should be faster for 2nd+ requests
+        # All should succeed
+        assert [r.status_code for r in responses] == [200, 200, 200]
 
-    def test_session_connection_per_host(self, httpbin_server):
+    def test_session_connection_per_host(self, httpbin_server, https_server, http11_session):
         """Test session maintains separate connections per host"""
-        # Use HTTP/1.1 for compatibility with postman-echo
-        session = httpmorph.Session(http2=False)
-
-        # Requests to different hosts
-        response1 = session.get(f"{httpbin_server}/get")
-        response2 = session.get("https://postman-echo.com/get")
+        # Requests to different origins
+        response1 = http11_session.get(f"{httpbin_server}/get")
+        response2 = http11_session.get(f"{https_server.url}/get", verify=False)
 
         assert response1.status_code == 200
         assert response2.status_code == 200
@@ -343,11 +328,9 @@ class TestRedirectHandling:
 class TestResponseLinks:
     """Tests for Response.links property"""
 
-    def test_links_property_exists(self, httpbin_server):
+    def test_links_property_exists(self, sample_response):
         """Test response has .links property"""
-        response = httpmorph.get(f"{httpbin_server}/links/5")
-
-        assert hasattr(response, "links")
+        assert hasattr(sample_response, "links")
 
     def test_links_parsing(self, httpbin_server):
         """Test Link header parsing"""
@@ -358,12 +341,10 @@ class TestResponseLinks:
 class TestResponseEncoding:
     """Tests for response encoding detection"""
 
-    def test_encoding_from_header(self, httpbin_server):
+    def test_encoding_from_header(self, sample_response):
         """Test encoding detected from Content-Type header"""
-        response = httpmorph.get(f"{httpbin_server}/get")
-
-        assert hasattr(response, "encoding")
-        assert response.encoding in ("utf-8", "UTF-8", None)
+        assert hasattr(sample_response, "encoding")
+        assert sample_response.encoding in ("utf-8", "UTF-8", None)
 
     def test_encoding_override(self, httpbin_server):
         """Test manually setting encoding"""
@@ -372,11 +353,9 @@ class TestResponseEncoding:
         response.encoding = "iso-8859-1"
         assert response.encoding == "iso-8859-1"
 
-    def test_apparent_encoding(self, httpbin_server):
+    def test_apparent_encoding(self, sample_response):
         """Test apparent_encoding detection"""
-        response = httpmorph.get(f"{httpbin_server}/html")
-
-        assert hasattr(response, "apparent_encoding")
+        assert hasattr(sample_response, "apparent_encoding")
         # Should detect encoding from content
 
 
@@ -405,12 +384,10 @@ class TestRequestObject:
 class TestResponseHistory:
     """Tests for response redirect history"""
 
-    def test_history_empty_no_redirects(self, httpbin_server):
+    def test_history_empty_no_redirects(self, sample_response):
         """Test history is empty when no redirects"""
-        response = httpmorph.get(f"{httpbin_server}/get")
-
-        assert hasattr(response, "history")
-        assert len(response.history) == 0
+        assert hasattr(sample_response, "history")
+        assert len(sample_response.history) == 0
 
     def test_history_contains_redirects(self, httpbin_server):
         """Test history contains all intermediate responses"""
@@ -433,19 +410,15 @@ class TestResponseHistory:
 class TestResponseIsRedirect:
     """Tests for response.is_redirect property"""
 
-    def test_is_redirect_for_3xx(self, httpbin_server):
+    @pytest.mark.parametrize("code", [301, 302, 303, 307, 308])
+    def test_is_redirect_for_3xx(self, httpbin_server, code):
         """Test is_redirect=True for 3xx codes"""
-        redirect_codes = [301, 302, 303, 307, 308]
-
-        for code in redirect_codes:
-            response = httpmorph.get(f"{httpbin_server}/status/{code}", allow_redirects=False)
-            assert response.is_redirect is True
+        response = httpmorph.get(f"{httpbin_server}/status/{code}", allow_redirects=False)
+        assert response.is_redirect is True
 
-    def test_not_redirect_for_2xx(self, httpbin_server):
+    def test_not_redirect_for_2xx(self, sample_response):
         """Test is_redirect=False for 2xx codes"""
-        response = httpmorph.get(f"{httpbin_server}/get")
-
-        assert response.is_redirect is False
+        assert sample_response.is_redirect is False
 
 
 class TestResponseRaw:
@@ -453,16 +426,39 @@ class TestResponseRaw:
 
     def test_raw_attribute_exists(self, httpbin_server):
         """Test response has .raw attribute"""
-        response = httpmorph.get(f"{httpbin_server}/get", stream=True)
-
-        assert hasattr(response, "raw")
+        with httpmorph.get(f"{httpbin_server}/get", stream=True) as response:
+            assert hasattr(response, "raw")
 
     def test_raw_read_method(self, httpbin_server):
         """Test raw.read() method"""
-        response = httpmorph.get(f"{httpbin_server}/bytes/100", stream=True)
-
-        data = response.raw.read(50)
-        assert len(data) == 50
+        with httpmorph.get(f"{httpbin_server}/bytes/100", stream=True) as response:
+            data = response.raw.read(50)
+            assert len(data) == 50
+
+    def test_raw_read_matches_iter_content(self, httpbin_server):
+        """Test repeated raw.read() returns the same bytes as iter_content()
+
+        /bytes serves a non-constant pattern, so a reordered, repeated or
+        dropped chunk changes the content, not just the length.
+        """
+        url = f"{httpbin_server}/bytes/65536"
+        with httpmorph.get(url, stream=True) as response:
+            iterated = b"".join(response.iter_content(chunk_size=8192))
+
+        with httpmorph.get(url, stream=True) as response:
+            read_chunks = list(iter(lambda: response.raw.read(8192), b""))
+
+        assert len(read_chunks) == 8
+        assert iterated == bytes_payload(65536)
+        assert b"".join(read_chunks) == iterated
+
+    def test_context_manager_closes_raw(self, httpbin_server):
+        """Test leaving the with block closes the response's raw stream"""
+        with httpmorph.get(f"{httpbin_server}/bytes/100", stream=True) as response:
+            raw = response.raw
+            assert not raw.closed
+
+        assert raw.closed
 
 
 if __name__ == "__main__":
@@ -55,14 +55,12 @@ class TestResponseJsonMethod:
 class TestResponseOkProperty:
     """Tests for Response.ok property"""
 
-    def test_ok_for_2xx_status(self, httpbin_server):
+    @pytest.mark.parametrize("status", [200, 201, 204])
+    def test_ok_for_2xx_status(self, httpbin_server, status):
         """Test .ok is True for 2xx status codes"""
-        test_cases = [200, 201, 204]
-
-        for expected_status in test_cases:
-            response = httpmorph.get(f"{httpbin_server}/status/{expected_status}")
-            assert response.status_code == expected_status
-            assert response.ok is True, f"Expected .ok=True for status {expected_status}"
+        response = httpmorph.get(f"{httpbin_server}/status/{status}")
+        assert response.status_code == status
+        assert response.ok is True
 
     def test_ok_for_3xx_status(self, httpbin_server):
         """Test .ok is True for 3xx redirects (before following)"""
@@ -70,23 +68,19 @@ class TestResponseOkProperty:
         assert response.status_code == 302
         assert response.ok is True
 
-    def test_not_ok_for_4xx_status(self, httpbin_server):
+    @pytest.mark.parametrize("status", [400, 401, 403, 404, 429])
+    def test_not_ok_for_4xx_status(self, httpbin_server, status):
         """Test .ok is False for 4xx client errors"""
-        test_cases = [400, 401, 403, 404, 429]
+        response = httpmorph.get(f"{httpbin_server}/status/{status}")
+        assert response.status_code == status
+        assert response.ok is False
 
-        for status in test_cases:
-            response = httpmorph.get(f"{httpbin_server}/status/{status}")
-            assert response.status_code == status
-            assert response.ok is False, f"Expected .ok=False for status {status}"
-
-    def test_not_ok_for_5xx_status(self, httpbin_server):
+    @pytest.mark.parametrize("status", [500, 502, 503, 504])
+    def test_not_ok_for_5xx_status(self, httpbin_server, status):
         """Test .ok is False for 5xx server errors"""
-        test_cases = [500, 502, 503, 504]
-
-        for status in test_cases:
-            response = httpmorph.get(f"{httpbin_server}/status/{status}")
-            assert response.status_code == status
-            assert response.ok is False, f"Expected .ok=False for status {status}"
+        response = httpmorph.get(f"{httpbin_server}/status/{status}")
+        assert response.status_code == status
+        assert response.ok is False
 
 
 class TestResponseRaiseForStatus:
@@ -128,9 +122,9 @@ class TestResponseRaiseForStatus:
 class TestResponseReasonProperty:
     """Tests for Response.reason property"""
 
-    def test_reason_for_common_statuses(self, httpbin_server):
-        """Test .reason returns correct HTTP reason phrase"""
-        test_cases = [
+    @pytest.mark.parametrize(
+        "status,expected_reason",
+        [
             (200, "OK"),
             (201, "Created"),
             (204, "No Content"),
@@ -143,16 +137,17 @@ class TestResponseReasonProperty:
             (500, "Internal Server Error"),
             (502, "Bad Gateway"),
             (503, "Service Unavailable"),
-        ]
-
-        for status, expected_reason in test_cases:
-            # Disable redirects for 3xx codes to check the reason phrase
-            allow_redirects = status < 300 or status >= 400
-            response = httpmorph.get(
-                f"{httpbin_server}/status/{status}", allow_redirects=allow_redirects
-            )
-            assert response.status_code == status
-            assert response.reason == expected_reason
+        ],
+    )
+    def test_reason_for_common_statuses(self, httpbin_server, status, expected_reason):
+        """Test .reason returns correct HTTP reason phrase"""
+        # Disable redirects for 3xx codes to check the reason phrase
+        allow_redirects = status < 300 or status >= 400
+        response = httpmorph.get(
+            f"{httpbin_server}/status/{status}", allow_redirects=allow_redirects
+        )
+        assert response.status_code == status
+        assert response.reason == expected_reason
 
 
 class TestResponseContentProperty:
@@ -374,10 +369,10 @@ class TestExceptionHierarchy:
             # Very short timeout should fail
             httpmorph.get(f"{httpbin_server}/delay/10", timeout=0.1)
 
-    def test_connection_error_exception(self, httpbin_server):
+    def test_connection_error_exception(self, closed_port_url):
         """Test ConnectionError for unreachable host"""
         with pytest.raises(httpmorph.ConnectionError):
-            httpmorph.get("http://invalid-host-that-does-not-exist-12345.com")
+            httpmorph.get(f"{closed_port_url}/")
 
     def test_http_error_from_raise_for_status(self, httpbin_server):
         """Test HTTPError from raise_for_status()"""
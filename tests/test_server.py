@@ -4,14 +4,30 @@ Test HTTP/HTTPS server for httpmorph testing
 Provides a simple HTTP/HTTPS server that can be used to test the httpmorph client.
 """
 
+import atexit
+import http.client
+import io
 import json
 import os
+import socket
 import ssl
+import sys
 import tempfile
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+# Repeating byte ramp served by /bytes/<n>. Its period, 251, is prime, so it
+# never lines up with power-of-two chunk sizes and misordered or dropped
+# chunks change the bytes, not just the length.
+BYTES_PATTERN = bytes(range(251))
+
+
+def bytes_payload(length: int) -> bytes:
+    """Body served by /bytes/<length>"""
+    repeats = length // len(BYTES_PATTERN) + 1
+    return (BYTES_PATTERN * repeats)[:length]
 
 
 class MockHTTPHandler(BaseHTTPRequestHandler):
@@ -306,7 +322,7 @@ class MockHTTPHandler(BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header("Content-Type", "application/octet-stream")
                 self.end_headers()
-                self.wfile.write(b"\x00" * length)
+                self.wfile.write(bytes_payload(length))
             except Exception:
                 self.send_response(400)
                 self.end_headers()
@@ -641,38 +657,196 @@ class MockHTTPHandler(BaseHTTPRequestHandler):
         self.wfile.write(json.dumps(response).encode())
 
 
+class _MemorySocket:
+    """Socket stand-in that reads from a byte buffer and records what is sent"""
+
+    def __init__(self, data: bytes = b""):
+        self._data = data
+        self.sent = io.BytesIO()
+
+    def makefile(self, mode="rb", *args, **kwargs):
+        return io.BytesIO(self._data)
+
+    def sendall(self, data):
+        self.sent.write(data)
+
+
+def request_in_memory(
+    method: str,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    body: bytes = b"",
+) -> http.client.HTTPResponse:
+    """Dispatch a request to MockHTTPHandler without opening a socket
+
+    The request is fed to the handler through an in-memory transport and
+    the raw reply is parsed back with http.client, so route logic can be
+    tested without loopback TCP. Use MockHTTPServer for anything that needs
+    a real connection (TLS, the httpmorph client, concurrency).
+    """
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost"]
+    for key, value in (headers or {}).items():
+        lines.append(f"{key}: {value}")
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    raw_request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    conn = _MemorySocket(raw_request)
+    MockHTTPHandler(conn, ("127.0.0.1", 0), None)
+
+    response = http.client.HTTPResponse(_MemorySocket(conn.sent.getvalue()), method=method)
+    response.begin()
+    return response
+
+
+def _create_self_signed_cert() -> Tuple[str, str]:
+    """Create a self-signed localhost certificate and return (cert_file, key_file)"""
+    try:
+        import datetime
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+    except ImportError:
+        # If cryptography is not available, skip SSL tests
+        raise RuntimeError("cryptography package required for SSL tests")
+
+    # ECDSA P-256 keygen is sub-millisecond, unlike 2048-bit RSA
+    key = ec.generate_private_key(ec.SECP256R1())
+
+    # Generate certificate
+    subject = issuer = x509.Name(
+        [
+            x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
+            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Test"),
+            x509.NameAttribute(NameOID.LOCALITY_NAME, "Test"),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "httpmorph"),
+            x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
+        ]
+    )
+
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(datetime.datetime.utcnow())
+        .not_valid_after(datetime.datetime.utcnow() + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [
+                    x509.DNSName("localhost"),
+                    x509.DNSName("127.0.0.1"),
+                ]
+            ),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+
+    # Write certificate and key to temp files
+    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".crt") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+        cert_file = f.name
+
+    with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".key") as f:
+        f.write(
+            key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.TraditionalOpenSSL,
+                encryption_algorithm=serialization.NoEncryption(),
+            )
+        )
+        key_file = f.name
+
+    return cert_file, key_file
+
+
+_shared_cert: Optional[Tuple[str, str]] = None
+_shared_cert_lock = threading.Lock()
+
+
+def _remove_shared_cert():
+    """Delete the shared certificate files at interpreter exit"""
+    if _shared_cert:
+        for path in _shared_cert:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def get_shared_cert() -> Tuple[str, str]:
+    """Get the process-wide self-signed certificate, generating it on first use"""
+    global _shared_cert
+    with _shared_cert_lock:
+        if _shared_cert is None:
+            _shared_cert = _create_self_signed_cert()
+            atexit.register(_remove_shared_cert)
+        return _shared_cert
+
+
+class MockThreadingHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTPServer that stays quiet about clients hanging up
+
+    Each connection gets its own daemon thread, so a slow route such as
+    /delay/<n> does not hold up the session-wide server for later tests.
+    A client that gave up on such a route leaves the handler writing to a
+    closed socket; that is expected and not worth a traceback.
+    """
+
+    def handle_error(self, request, client_address):
+        # TLS connections report the same hang-up as an unexpected EOF
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError, ssl.SSLEOFError)):
+            return
+        super().handle_error(request, client_address)
+
+
 class MockHTTPServer:
     """Mock HTTP/HTTPS server for testing"""
 
-    def __init__(self, port: int = 0, ssl_enabled: bool = False):
+    def __init__(
+        self,
+        port: int = 0,
+        ssl_enabled: bool = False,
+        cert_file: Optional[str] = None,
+        key_file: Optional[str] = None,
+    ):
         self.port = port
         self.ssl_enabled = ssl_enabled
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[MockThreadingHTTPServer] = None
         self.thread: Optional[threading.Thread] = None
-        self.cert_file = None
-        self.key_file = None
+        self.cert_file = cert_file
+        self.key_file = key_file
+        self._ssl_context: Optional[ssl.SSLContext] = None
 
     def start(self):
         """Start the test server"""
-        self.server = HTTPServer(("127.0.0.1", self.port), MockHTTPHandler)
+        self.server = MockThreadingHTTPServer(("127.0.0.1", self.port), MockHTTPHandler)
 
         if self.ssl_enabled:
-            # Create self-signed certificate for testing
-            self._create_self_signed_cert()
-            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-            context.load_cert_chain(self.cert_file, self.key_file)
-            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+            # Reuse the shared self-signed certificate unless one was given
+            if not self.cert_file:
+                self.cert_file, self.key_file = get_shared_cert()
+            self._ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self._ssl_context.load_cert_chain(self.cert_file, self.key_file)
+            self.server.socket = self._ssl_context.wrap_socket(self.server.socket, server_side=True)
 
         # Get the actual port if 0 was specified
         self.port = self.server.server_port
 
-        # Start server in background thread
-        self.thread = threading.Thread(target=self.server.serve_forever)
+        # Start in background thread. The socket is already listening, so
+        # early connects queue in the backlog; just wait for the loop to run.
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._serve, args=(ready,))
         self.thread.daemon = True
         self.thread.start()
+        ready.wait(timeout=1)
 
-        # Wait a bit for server to start
-        time.sleep(0.1)
+    def _serve(self, ready: threading.Event):
+        """Signal readiness, then run the accept loop"""
+        ready.set()
+        self.server.serve_forever()
 
     def stop(self):
         """Stop the test server"""
@@ -682,77 +856,23 @@ class MockHTTPServer:
         if self.thread:
             self.thread.join(timeout=1)
 
-        # Clean up certificate files
-        if self.cert_file and os.path.exists(self.cert_file):
-            os.unlink(self.cert_file)
-        if self.key_file and os.path.exists(self.key_file):
-            os.unlink(self.key_file)
+    def serve_connection(self, sock: socket.socket):
+        """Serve one already-connected socket, e.g. one end of a socketpair
 
-    def _create_self_signed_cert(self):
-        """Create a self-signed certificate for testing"""
+        Blocks until the client closes the connection, so run it in a thread.
+        """
+        assert self.server is not None, "server must be started first"
+        client_address = ("127.0.0.1", 0)
         try:
-            import datetime
-
-            from cryptography import x509
-            from cryptography.hazmat.primitives import hashes, serialization
-            from cryptography.hazmat.primitives.asymmetric import rsa
-            from cryptography.x509.oid import NameOID
-
-            # Generate private key
-            key = rsa.generate_private_key(
-                public_exponent=65537,
-                key_size=2048,
-            )
-
-            # Generate certificate
-            subject = issuer = x509.Name(
-                [
-                    x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
-                    x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Test"),
-                    x509.NameAttribute(NameOID.LOCALITY_NAME, "Test"),
-                    x509.NameAttribute(NameOID.ORGANIZATION_NAME, "httpmorph"),
-                    x509.NameAttribute(NameOID.COMMON_NAME, "localhost"),
-                ]
-            )
-
-            cert = (
-                x509.CertificateBuilder()
-                .subject_name(subject)
-                .issuer_name(issuer)
-                .public_key(key.public_key())
-                .serial_number(x509.random_serial_number())
-                .not_valid_before(datetime.datetime.utcnow())
-                .not_valid_after(datetime.datetime.utcnow() + datetime.timedelta(days=1))
-                .add_extension(
-                    x509.SubjectAlternativeName(
-                        [
-                            x509.DNSName("localhost"),
-                            x509.DNSName("127.0.0.1"),
-                        ]
-                    ),
-                    critical=False,
-                )
-                .sign(key, hashes.SHA256())
-            )
-
-            # Write certificate and key to temp files
-            with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".crt") as f:
-                f.write(cert.public_bytes(serialization.Encoding.PEM))
-                self.cert_file = f.name
-
-            with tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=".key") as f:
-                f.write(
-                    key.private_bytes(
-                        encoding=serialization.Encoding.PEM,
-                        format=serialization.PrivateFormat.TraditionalOpenSSL,
-                        encryption_algorithm=serialization.NoEncryption(),
-                    )
-                )
-                self.key_file = f.name
-
-        except ImportError:
-            # If cryptography is not available, skip SSL tests
-            raise RuntimeError("cryptography package required for SSL tests")
+            if self._ssl_context is not None:
+                sock = self._ssl_context.wrap_socket(sock, server_side=True)
+            self.server.finish_request(sock, client_address)
+        except Exception:
+            # Report TLS and handler failures like the accept loop does, so a
+            # broken bridge shows a traceback instead of an opaque client error
+            self.server.handle_error(sock, client_address)
+        finally:
+            self.server.shutdown_request(sock)
 
     @property
     def url(self):
@@ -67,7 +67,7 @@ class TestSession:
             response = session.get(f"{server.url}/get")
             assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
 
-    def test_session_post_request(self, httpbin_host):
+    def test_session_post_request(self):
         """Test POST request using session"""
         with MockHTTPServer() as server:
             session = httpmorph.Session(browser="chrome")
@@ -75,7 +75,7 @@ class TestSession:
             response = session.post(f"{server.url}/post", json=data)
             assert response.status_code in [200, 402]  # httpbingo returns 402 for HTTP/2
 
-    def test_session_multiple_requests(self, httpbin_host):
+    def test_session_multiple_requests(self):
         """Test multiple requests with same session"""
         with MockHTTPServer() as server:
             session = httpmorph.Session(browser="chrome")
@@ -137,7 +137,7 @@ class TestSession:
         # Cookie count should be stable (same cookies)
         assert cookies_after >= cookies_before, "Cookies were lost between requests"
 
-    def test_session_context_manager(self, httpbin_host):
+    def test_session_context_manager(self):
         """Test session as context manager"""
         with MockHTTPServer() as server:
             with httpmorph.Session(browser="chrome") as session: